@@ -3,9 +3,17 @@
 Analyze a specific forecast to demonstrate the fix for day offset calculation.
 """
 
+import mmap
 import re
 from datetime import datetime
 
+# Compiled once at import; the period pattern's lookahead is expensive to
+# recompile and re.sub with a literal pattern hits the re cache on every call.
+PERIOD_PATTERN = re.compile(
+    r'\.([A-Z]{3,7}(?:\s+NIGHT)?)\.\.\.(.*?)(?=\n\.[A-Z]{3,7}(?:\s+NIGHT)?\.\.\.|\Z)',
+    re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
 def find_specific_forecast(timestamp, original_file, processed_file):
     """
     Find a specific forecast by timestamp in both files.
@@ -18,29 +26,32 @@ def find_specific_forecast(timestamp, original_file, processed_file):
     Returns:
         Tuple of (original_content, processed_content)
     """
-    # Read original file
-    with open(original_file, 'r', encoding='utf-8') as file:
-        original_content = file.read()
-
-    # Read processed file
-    with open(processed_file, 'r', encoding='utf-8') as file:
-        processed_content = file.read()
-
-    # Find original forecast block
-    original_blocks = original_content.split('$$')
-    original_forecast = None
-    for block in original_blocks:
-        if timestamp in block:
-            original_forecast = block.strip()
-            break
-
-    # Find processed forecast block
-    processed_blocks = processed_content.split('$$')
-    processed_forecast = None
-    for block in processed_blocks:
-        if timestamp in block:
-            processed_forecast = block.strip()
-            break
+    timestamp_bytes = timestamp.encode('ascii')
+
+    def extract_block(file_path):
+        # Memory-map the file and search bytes directly: the OS pages in only
+        # the regions .find() touches, and the single enclosing block is the
+        # only thing decoded to str. Expand outward from the timestamp to the
+        # '$$' delimiters rather than splitting the whole file into blocks.
+        with open(file_path, 'rb') as file:
+            try:
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                return None  # Empty file cannot be mapped
+
+            with mm:
+                idx = mm.find(timestamp_bytes)
+                if idx < 0:
+                    return None
+                start = mm.rfind(b'$$', 0, idx)
+                start = 0 if start < 0 else start + 2
+                end = mm.find(b'$$', idx)
+                if end < 0:
+                    end = len(mm)
+                return mm[start:end].decode('utf-8').strip()
+
+    original_forecast = extract_block(original_file)
+    processed_forecast = extract_block(processed_file)
 
     return original_forecast, processed_forecast
 
@@ -59,8 +70,7 @@ def simulate_sequential_fix(original_forecast, timestamp):
     forecast_time = datetime.fromisoformat(timestamp[:-6])  # Remove timezone
 
     # Extract forecast periods
-    period_pattern = r'\.([A-Z]{3,7}(?:\s+NIGHT)?)\.\.\.(.*?)(?=\n\.[A-Z]{3,7}(?:\s+NIGHT)?\.\.\.|\Z)'
-    periods = re.findall(period_pattern, original_forecast, re.DOTALL)
+    periods = PERIOD_PATTERN.findall(original_forecast)
 
     # Calculate forecast date
     forecast_date = forecast_time.date()
@@ -79,7 +89,7 @@ def simulate_sequential_fix(original_forecast, timestamp):
 
     for i, (period_name, period_content) in enumerate(periods):
         # Clean up content
-        content = re.sub(r'\s+', ' ', period_content.strip())
+        content = WHITESPACE_PATTERN.sub(' ', period_content.strip())
         content = content.replace('Wave Detail:', 'Waves:')
 
         # Calculate target date
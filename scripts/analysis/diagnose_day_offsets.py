@@ -5,9 +5,38 @@ and analyze the original forecast content to understand the root cause.
 """
 
 import re
+from collections import defaultdict
 from pathlib import Path
 from datetime import datetime
 
+# Compiled once at import so the per-block scans below skip repeated pattern parsing.
+DAY_OFFSET_PATTERN = re.compile(r'D[5-9]_')
+ISSUED_TIMESTAMP_PATTERN = re.compile(r'Issued: (\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}-08:00)')
+PROBLEM_LABEL_PATTERN = re.compile(r'D[5-9]_[A-Z]+')
+ORIGINAL_PERIOD_PATTERN = re.compile(r'\.([A-Z]{3,7}(?:\s+NIGHT)?)\.\.\.[^.]*?(?=\n\.|\Z)', re.DOTALL)
+PROCESSED_PERIOD_PATTERN = re.compile(r'(D\d+_[A-Z]+) \([^)]+\)')
+WEEKDAY_PATTERN = re.compile(r'\.([A-Z]{3})(?:\s+NIGHT)?\.\.\.')
+
+def iter_blocks(content):
+    """
+    Yield '$$'-delimited forecast blocks without materializing a split() list.
+
+    Walks the content with str.find (C-level substring search), so only the
+    index pairs are computed and each block is sliced out lazily.
+    """
+    pos = 0
+    while True:
+        delimiter = content.find('$$', pos)
+        if delimiter < 0:
+            block = content[pos:]
+        else:
+            block = content[pos:delimiter]
+        if block.strip():
+            yield block
+        if delimiter < 0:
+            break
+        pos = delimiter + 2
+
 def find_problematic_forecasts(output_file, original_file):
     """
     Find forecasts with D5+ day offsets and match them to original content.
@@ -17,7 +46,7 @@ def find_problematic_forecasts(output_file, original_file):
         original_file: Path to original forecast file
 
     Returns:
-        List of problematic forecast examples
+        Tuple of (problematic forecast list, D5+ label count dict)
     """
     print("DIAGNOSTIC ANALYSIS: Problematic Day Offsets (D5+)")
     print("=" * 60)
@@ -30,17 +59,18 @@ def find_problematic_forecasts(output_file, original_file):
     with open(original_file, 'r', encoding='utf-8') as file:
         original_content = file.read()
 
-    # Split into forecast blocks
-    processed_blocks = processed_content.split('$$')
-    original_blocks = original_content.split('$$')
+    # Original blocks are searched repeatedly by timestamp, so keep a list;
+    # processed blocks are streamed without the split('$$') allocation
+    original_blocks = list(iter_blocks(original_content))
 
     problematic_cases = []
+    label_counts = defaultdict(int)
 
     # Find blocks with D5+ offsets
-    for i, block in enumerate(processed_blocks):
-        if re.search(r'D[5-9]_', block):
+    for block in iter_blocks(processed_content):
+        if DAY_OFFSET_PATTERN.search(block):
             # Extract timestamp for matching
-            timestamp_match = re.search(r'Issued: (\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}-08:00)', block)
+            timestamp_match = ISSUED_TIMESTAMP_PATTERN.search(block)
             if timestamp_match:
                 timestamp = timestamp_match.group(1)
 
@@ -52,8 +82,10 @@ def find_problematic_forecasts(output_file, original_file):
                         break
 
                 if original_block:
-                    # Extract problematic day labels
-                    problem_labels = re.findall(r'D[5-9]_[A-Z]+', block)
+                    # Extract problematic day labels and count them inline
+                    problem_labels = PROBLEM_LABEL_PATTERN.findall(block)
+                    for label in problem_labels:
+                        label_counts[label] += 1
 
                     problematic_cases.append({
                         'timestamp': timestamp,
@@ -62,7 +94,7 @@ def find_problematic_forecasts(output_file, original_file):
                         'original_block': original_block
                     })
 
-    return problematic_cases
+    return problematic_cases, dict(label_counts)
 
 def analyze_forecast_case(case):
     """
@@ -84,15 +116,14 @@ def analyze_forecast_case(case):
     print("\nORIGINAL FORECAST CONTENT:")
     print("-" * 30)
     # Extract just the forecast periods from original
-    original_periods = re.findall(r'\.([A-Z]{3,7}(?:\s+NIGHT)?)\.\.\.[^.]*?(?=\n\.|\Z)',
-                                 case['original_block'], re.DOTALL)
+    original_periods = ORIGINAL_PERIOD_PATTERN.findall(case['original_block'])
     for period in original_periods[:10]:  # Show first 10 periods
         print(f"  .{period}...")
 
     print("\nPROCESSED OUTPUT:")
     print("-" * 20)
     # Extract processed periods
-    processed_periods = re.findall(r'(D\d+_[A-Z]+) \([^)]+\)', case['processed_block'])
+    processed_periods = PROCESSED_PERIOD_PATTERN.findall(case['processed_block'])
     for period in processed_periods[:10]:  # Show first 10 periods
         print(f"  {period}")
 
@@ -100,7 +131,7 @@ def analyze_forecast_case(case):
     print("-" * 20)
 
     # Analyze weekday pattern
-    original_weekdays = re.findall(r'\.([A-Z]{3})(?:\s+NIGHT)?\.\.\.', case['original_block'])
+    original_weekdays = WEEKDAY_PATTERN.findall(case['original_block'])
     print(f"Original weekday sequence: {original_weekdays[:10]}")
 
     # Check for extended forecast periods
@@ -135,7 +166,7 @@ def main():
         return
 
     # Find problematic forecasts
-    problematic_cases = find_problematic_forecasts(output_file, original_file)
+    problematic_cases, label_counts = find_problematic_forecasts(output_file, original_file)
 
     print(f"\nFOUND {len(problematic_cases)} problematic forecasts with D5+ offsets")
 
@@ -149,13 +180,7 @@ def main():
         print(f"\nSUMMARY STATISTICS:")
         print(f"Total problematic forecasts: {len(problematic_cases)}")
 
-        # Count by day offset
-        all_labels = []
-        for case in problematic_cases:
-            all_labels.extend(case['problem_labels'])
-
-        from collections import Counter
-        label_counts = Counter(all_labels)
+        # Counts were aggregated during the scan
         print("Problematic label frequency:")
         for label, count in sorted(label_counts.items()):
             print(f"  {label}: {count} occurrences")
@@ -7,6 +7,88 @@ This will help verify if the current processed files contain invalid data.
 from pathlib import Path
 import re
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Fall back to the pure-Python scan
+
+# Exact string forms the sentinels take in the processed files; matching on
+# the string avoids a float() call (and a slow ValueError unwind for 'null')
+# on every cell.
+SENTINEL_999_STRINGS = frozenset(('999', '999.0', '999.00'))
+SENTINEL_99_STRINGS = frozenset(('99', '99.0', '99.00'))
+
+COLUMN_BUCKETS = {
+    'PRES': 'invalid_pressure',
+    'ATMP': 'invalid_temperature',
+    'WDIR': 'invalid_wind_dir',
+    'WSPD': 'invalid_wind_speed',
+    'GST': 'invalid_gust',
+}
+
+def scan_sentinels(header_line, data_lines, sentinel_issues):
+    """Pure-Python sentinel scan (fallback when NumPy is unavailable)."""
+    for i, line in enumerate(data_lines):
+        columns = line.split()
+        if len(columns) != len(header_line):
+            continue
+
+        for j, (col_name, value) in enumerate(zip(header_line, columns)):
+            if col_name == 'DATETIME_PST':
+                continue
+
+            # Check for sentinel values
+            if value in SENTINEL_999_STRINGS:
+                sentinel_issues["lines_with_999"].append((i+1, col_name, value))
+                if col_name in COLUMN_BUCKETS:
+                    sentinel_issues[COLUMN_BUCKETS[col_name]] += 1
+
+            elif value in SENTINEL_99_STRINGS and col_name != 'WDIR':
+                # 99 is invalid unless it's wind direction
+                sentinel_issues["lines_with_99"].append((i+1, col_name, value))
+
+            elif value == 'null' or value == 'NULL':
+                sentinel_issues["null_values"] += 1
+
+def scan_sentinels_vectorized(header_line, data_lines, sentinel_issues):
+    """
+    NumPy sentinel scan: one C-level columnwise comparison per column
+    instead of a Python float() call per cell.
+
+    Sentinel values are integer-exact in the source files (999, 999.0,
+    99, 99.0 all parse to the same float), so plain equality is used
+    instead of a floating-point tolerance test.
+    """
+    numeric_cols = [j for j, name in enumerate(header_line) if name != 'DATETIME_PST']
+    if not data_lines or not numeric_cols:
+        return
+
+    arr = np.genfromtxt(
+        data_lines,
+        usecols=numeric_cols,
+        missing_values='null',
+        filling_values=np.nan,
+        invalid_raise=False)
+    arr = np.atleast_2d(arr)
+
+    sentinel_issues["null_values"] = int(np.isnan(arr).sum())
+
+    for k, j in enumerate(numeric_cols):
+        col_name = header_line[j]
+        col = arr[:, k]
+
+        mask_999 = col == 999
+        for idx in np.flatnonzero(mask_999):
+            sentinel_issues["lines_with_999"].append((int(idx)+1, col_name, f"{col[idx]:g}"))
+        if col_name in COLUMN_BUCKETS:
+            sentinel_issues[COLUMN_BUCKETS[col_name]] += int(mask_999.sum())
+
+        if col_name != 'WDIR':
+            # 99 is invalid unless it's wind direction
+            mask_99 = col == 99
+            for idx in np.flatnonzero(mask_99):
+                sentinel_issues["lines_with_99"].append((int(idx)+1, col_name, f"{col[idx]:g}"))
+
 def validate_processed_file(file_path):
     """
     Validate a processed wind data file for sentinel values and data quality.
@@ -50,39 +132,10 @@ def validate_processed_file(file_path):
         "invalid_gust": 0
     }
 
-    for i, line in enumerate(data_lines):
-        columns = line.split()
-        if len(columns) != len(header_line):
-            continue
-
-        for j, (col_name, value) in enumerate(zip(header_line, columns)):
-            if col_name == 'DATETIME_PST':
-                continue
-
-            try:
-                float_val = float(value)
-
-                # Check for sentinel values
-                if abs(float_val - 999) < 0.01:
-                    sentinel_issues["lines_with_999"].append((i+1, col_name, value))
-                    if col_name == 'PRES':
-                        sentinel_issues["invalid_pressure"] += 1
-                    elif col_name == 'ATMP':
-                        sentinel_issues["invalid_temperature"] += 1
-                    elif col_name == 'WDIR':
-                        sentinel_issues["invalid_wind_dir"] += 1
-                    elif col_name == 'WSPD':
-                        sentinel_issues["invalid_wind_speed"] += 1
-                    elif col_name == 'GST':
-                        sentinel_issues["invalid_gust"] += 1
-
-                elif abs(float_val - 99) < 0.01 and col_name != 'WDIR':
-                    # 99 is invalid unless it's wind direction
-                    sentinel_issues["lines_with_99"].append((i+1, col_name, value))
-
-            except ValueError:
-                if value.lower() == 'null':
-                    sentinel_issues["null_values"] += 1
+    if np is not None:
+        scan_sentinels_vectorized(header_line, data_lines, sentinel_issues)
+    else:
+        scan_sentinels(header_line, data_lines, sentinel_issues)
 
     # Print summary
     if any(sentinel_issues["lines_with_999"]) or any(sentinel_issues["lines_with_99"]):
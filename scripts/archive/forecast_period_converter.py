@@ -11,10 +11,78 @@ Converts:
 This makes forecasts more LLM-friendly by using relative time references.
 """
 
+import mmap
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from multiprocessing import Pool
 from pathlib import Path
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None  # Fall back to the compiled re pattern
+
+# Compiled once at import: the per-block calls below skip the re module's
+# pattern-cache lookup, and the large period pattern is parsed exactly once.
+WARNING_PATTERN = re.compile(r'^\.\.\.([^.]*?)\.\.\.(?:\n|$)', re.MULTILINE)
+# Matches just the period label anchors (".TODAY...", ".MON NIGHT..", etc.);
+# content is sliced between consecutive anchors instead of matched with a
+# lazy .*? plus a lookahead that duplicates the whole alternation.
+# Handles both ...(3 dots) and ..(2 dots) cases for malformed data and
+# captures "REST OF" periods and "THIS AFTERNOON".
+# Label words are usually single-spaced but the raw corpus contains
+# double-spaced anchors (e.g. ".SUN  NIGHT..."), so the separators stay
+# \s+; the bounded {2,3} dot quantifier keeps the program small.
+PERIOD_ANCHOR_PATTERN = re.compile(
+    r'^\.(REST\s+OF\s+[A-Z]+|THIS\s+AFTERNOON|[A-Z]{3,7}(?:\s+NIGHT)?)\.{2,3}',
+    re.MULTILINE)
+TIMESTAMP_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}-08:00')
+BLANK_LINES_PATTERN = re.compile(r'\n\s*\n')
+
+# Optional Hyperscan database for the anchor pattern: a DFA scans the text
+# in one linear pass with no backtracking. Built once at import when the
+# dependency is installed.
+if hyperscan is not None:
+    ANCHOR_DB = hyperscan.Database()
+    ANCHOR_DB.compile(
+        expressions=[rb'^\.(REST\s+OF\s+[A-Z]+|THIS\s+AFTERNOON|[A-Z]{3,7}(\s+NIGHT)?)\.{2,3}'],
+        ids=[0],
+        flags=[hyperscan.HS_FLAG_MULTILINE | hyperscan.HS_FLAG_SOM_LEFTMOST])
+else:
+    ANCHOR_DB = None
+
+# Fixed-name periods resolve through one dict probe: (label suffix, how far
+# the day offset advances afterwards). Weekday periods fall through to the
+# suffix checks below.
+PERIOD_DISPATCH = {
+    'REST OF TODAY': ('_DAY', 0),
+    'REST OF TONIGHT': ('_NIGHT', 1),
+    'THIS AFTERNOON': ('_DAY', 0),
+    'TONIGHT': ('_NIGHT', 1),
+    'TODAY': ('_DAY', 0),
+}
+
+# Period names that stay on the current day when they follow a day period
+SAME_DAY_PERIOD_NAMES = frozenset(('TONIGHT', 'TODAY', 'REST OF TONIGHT', 'THIS AFTERNOON'))
+
+# Relative-label lookup tables: day offsets are small and bounded, so an
+# index into these replaces an f-string format call per period
+DAY_LABELS = tuple(f'D{k}_DAY' for k in range(32))
+NIGHT_LABELS = tuple(f'D{k}_NIGHT' for k in range(32))
+
+@lru_cache(maxsize=4096)
+def _period_isos(date_ordinal):
+    """
+    ISO date strings for a forecast date and the days that follow it.
+
+    Keyed on the ordinal so the table is computed once per unique forecast
+    date across the whole corpus; 16 entries comfortably covers extended
+    forecasts that run past D7.
+    """
+    base = date.fromordinal(date_ordinal)
+    return tuple((base + timedelta(days=k)).isoformat() for k in range(16))
+
 def parse_forecast_timestamp(timestamp_str):
     """
     Parse ISO timestamp string to datetime object.
@@ -60,16 +128,23 @@ def calculate_period_dates(forecast_time):
     period_mapping = {}
 
     # DAY_0 is always the forecast issuance date
-    period_mapping['TODAY'] = (0, forecast_date.isoformat())
-    period_mapping['TONIGHT'] = (0, forecast_date.isoformat())
+    base_iso = forecast_date.isoformat()
+    period_mapping['TODAY'] = (0, base_iso)
+    period_mapping['TONIGHT'] = (0, base_iso)
+
+    # Calculate next 7 days and their weekday names: one .weekday() call per
+    # forecast and a modular walk around the week, with the dates drawn from
+    # the cached ISO table instead of seven timedelta additions
+    weekdays = ('MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN')
+    base_weekday = forecast_date.weekday()
+    period_isos = _period_isos(forecast_date.toordinal())
 
-    # Calculate next 7 days and their weekday names
     for day_offset in range(1, 8):
-        future_date = forecast_date + timedelta(days=day_offset)
-        weekday_name = get_weekday_name(future_date)
+        weekday_name = weekdays[(base_weekday + day_offset) % 7]
+        future_iso = period_isos[day_offset]
 
-        period_mapping[weekday_name] = (day_offset, future_date.isoformat())
-        period_mapping[f'{weekday_name} NIGHT'] = (day_offset, future_date.isoformat())
+        period_mapping[weekday_name] = (day_offset, future_iso)
+        period_mapping[f'{weekday_name} NIGHT'] = (day_offset, future_iso)
 
     return period_mapping
 
@@ -83,29 +158,56 @@ def extract_warnings(forecast_text):
     Returns:
         Tuple of (warning_paragraph, cleaned_content)
     """
-    # Find all warning lines (lines that start and end with ...)
-    warning_pattern = r'^\.\.\.([^.]*?)\.\.\.(?:\n|$)'
-    warning_matches = re.findall(warning_pattern, forecast_text, re.MULTILINE)
+    # One finditer pass both collects the warning texts and copies the
+    # unmatched spans, instead of scanning the block twice (findall + sub)
+    combined_warnings = []
+    kept_spans = []
+    last_end = 0
+
+    for match in WARNING_PATTERN.finditer(forecast_text):
+        # Clean up the warning text - remove extra whitespace and newlines
+        combined_warnings.append(' '.join(match.group(1).split()))
+        kept_spans.append(forecast_text[last_end:match.start()])
+        last_end = match.end()
 
-    if not warning_matches:
+    if not combined_warnings:
         return None, forecast_text
 
-    # Combine all warnings into a single paragraph
-    combined_warnings = []
-    for warning in warning_matches:
-        # Clean up the warning text - remove extra whitespace and newlines
-        clean_warning = re.sub(r'\s+', ' ', warning.strip())
-        combined_warnings.append(clean_warning)
+    kept_spans.append(forecast_text[last_end:])
 
     # Create warning paragraph with semicolons between multiple warnings
     warning_paragraph = "WARNING: " + "; ".join(combined_warnings)
 
-    # Remove warning lines from the original content
-    clean_content = re.sub(warning_pattern, '', forecast_text, flags=re.MULTILINE)
-    clean_content = re.sub(r'\n\s*\n', '\n\n', clean_content).strip()  # Clean up extra newlines
+    clean_content = ''.join(kept_spans)
+    clean_content = BLANK_LINES_PATTERN.sub('\n\n', clean_content).strip()  # Clean up extra newlines
 
     return warning_paragraph, clean_content
 
+def _find_period_anchors(forecast_text):
+    """
+    Return (anchor_start, anchor_end, period_name) for each period label.
+
+    Scans with the Hyperscan DFA when available, keeping the longest match
+    per start position (Hyperscan reports every match length); otherwise
+    uses the compiled re pattern.
+    """
+    if ANCHOR_DB is not None:
+        spans = {}
+
+        def on_match(pattern_id, start, end, flags, context=None):
+            prev = spans.get(start)
+            if prev is None or end > prev:
+                spans[start] = end
+
+        # Forecast text is ASCII, so byte offsets equal character offsets
+        ANCHOR_DB.scan(forecast_text.encode('utf-8'), match_event_handler=on_match)
+
+        return [(start, spans[start], forecast_text[start:spans[start]].strip('.'))
+                for start in sorted(spans)]
+
+    return [(m.start(), m.end(), m.group(1))
+            for m in PERIOD_ANCHOR_PATTERN.finditer(forecast_text)]
+
 def convert_forecast_periods(forecast_text, forecast_time):
     """
     Convert day-of-week period labels to relative day format using context-aware mapping.
@@ -116,23 +218,24 @@ def convert_forecast_periods(forecast_text, forecast_time):
         forecast_time: datetime object for forecast issuance
 
     Returns:
-        String with converted period labels, collapsed to single lines
+        List of single-line period strings (or the original text as a
+        one-element list when no periods are found), so the caller can
+        hand the fragments straight to writelines
     """
-    # Define regex pattern to match period labels and their content
-    # Handle both ...(3 dots) and ..(2 dots) cases for malformed data
-    # Enhanced to capture "REST OF" periods and "THIS AFTERNOON"
-    period_pattern = r'\.((REST\s+OF\s+[A-Z]+)|(THIS\s+AFTERNOON)|([A-Z]{3,7}(?:\s+NIGHT)?))\.\.\.?(.*?)(?=\n\.((REST\s+OF\s+[A-Z]+)|(THIS\s+AFTERNOON)|([A-Z]{3,7}(?:\s+NIGHT)?))\.\.\.?|\Z)'
+    # Locate period anchors in one linear pass
+    anchors = _find_period_anchors(forecast_text)
 
-    # Extract all periods first
-    periods = re.findall(period_pattern, forecast_text, re.DOTALL)
-
-    if not periods:
-        return forecast_text
+    if not anchors:
+        return [forecast_text]
 
     # Context-aware period mapping
     forecast_date = forecast_time.date()
     issue_hour = forecast_time.hour
 
+    # One cached table lookup per period instead of a timedelta add + date
+    # allocation + isoformat call
+    period_isos = _period_isos(forecast_date.toordinal())
+
     # Determine starting context based on issuance time
     if issue_hour < 6:  # Early morning (midnight to 6 AM) - we're in night period
         current_day_offset = 0
@@ -143,165 +246,226 @@ def convert_forecast_periods(forecast_text, forecast_time):
 
     # Allow extended forecasts - no artificial cap
 
-    # Process periods sequentially to handle day/night logic correctly
+    # Process periods sequentially to handle day/night logic correctly.
+    # The hot callables are bound to locals so the loop below pays one
+    # attribute lookup per name instead of one per period.
     converted_periods = []
+    converted_append = converted_periods.append
     current_day_offset = 0 if issue_hour < 6 else 0
 
-    # Extract period names and content from the new regex structure
-    # New regex returns: (full_match, rest_of_match, this_afternoon_match, standard_match, content, lookahead_groups...)
+    # Each period's content runs from the end of its anchor to the start of
+    # the next one, so slicing between anchors replaces the lazy-match pass.
+    # The night flag is computed once here so the classifier and its
+    # lookahead test a boolean instead of re-running suffix matches.
     processed_periods = []
-    for match in periods:
-        if match[1]:  # REST OF match (group 1)
-            period_name = match[1]  # e.g., "REST OF TODAY"
-            period_content = match[4]  # content (group 4)
-        elif match[2]:  # THIS AFTERNOON match (group 2)
-            period_name = match[2]  # "THIS AFTERNOON"
-            period_content = match[4]  # content (group 4)
-        elif match[3]:  # Standard match (group 3)
-            period_name = match[3]  # e.g., "TONIGHT", "MON"
-            period_content = match[4]  # content (group 4)
-        else:
-            continue  # Skip invalid matches
+    for k, (start, end, period_name) in enumerate(anchors):
+        content_end = anchors[k + 1][0] if k + 1 < len(anchors) else len(forecast_text)
+        is_night = (period_name.endswith(' NIGHT') or
+                    period_name == 'TONIGHT' or period_name == 'REST OF TONIGHT')
+        processed_periods.append((period_name, forecast_text[end:content_end], is_night))
 
-        processed_periods.append((period_name, period_content))
-
-    for i, (period_name, period_content) in enumerate(processed_periods):
+    for i, (period_name, period_content, is_night) in enumerate(processed_periods):
         # Calculate target date
-        target_date = forecast_date
-        if current_day_offset > 0:
-            from datetime import timedelta
-            target_date = forecast_date + timedelta(days=current_day_offset)
+        if current_day_offset < len(period_isos):
+            target_date = period_isos[current_day_offset]
+        else:
+            target_date = (forecast_date + timedelta(days=current_day_offset)).isoformat()
 
         # Clean content
-        collapsed_content = re.sub(r'\s+', ' ', period_content.strip())
-        collapsed_content = collapsed_content.replace('Wave Detail:', 'Waves:')
-
-        # Determine period type and label using context-aware logic
-        if period_name == 'REST OF TODAY':
-            relative_label = f'D{current_day_offset}_DAY'
-            # REST OF TODAY doesn't increment day offset (current day)
-
-        elif period_name == 'REST OF TONIGHT':
-            relative_label = f'D{current_day_offset}_NIGHT'
-            # After REST OF TONIGHT, increment day offset for next day
-            current_day_offset += 1
-
-        elif period_name == 'THIS AFTERNOON':
-            relative_label = f'D{current_day_offset}_DAY'
-            # THIS AFTERNOON doesn't increment day offset (same day)
-
-        elif period_name == 'TONIGHT':
-            relative_label = f'D{current_day_offset}_NIGHT'
-            # After TONIGHT, increment day offset for next day period
-            current_day_offset += 1
-
-        elif period_name == 'TODAY':
-            relative_label = f'D{current_day_offset}_DAY'
-            # TODAY doesn't increment day offset
-
-        elif period_name.endswith(' NIGHT'):
-            relative_label = f'D{current_day_offset}_NIGHT'
+        # split() with no argument already folds any whitespace run, so the
+        # join/split idiom collapses in one C pass with no regex engine
+        collapsed_content = ' '.join(period_content.split())
+        # Gate the substitution: most periods carry no wave detail, and the
+        # membership test bails at the first miss instead of a full replace
+        # scan. Tested after collapsing so a line-wrapped marker still hits.
+        if 'Wave Detail:' in collapsed_content:
+            collapsed_content = collapsed_content.replace('Wave Detail:', 'Waves:')
+
+        # Determine period type and label using context-aware logic:
+        # fixed names go through the dispatch table, everything else is a
+        # night or regular weekday period
+        dispatch = PERIOD_DISPATCH.get(period_name)
+        if dispatch is not None:
+            suffix, increment = dispatch
+        elif is_night:
             # After any NIGHT period, increment day offset for next day
-            current_day_offset += 1
+            suffix, increment = '_NIGHT', 1
+        else:
+            # Regular day period (MON, TUE, WED, etc.): increment only when
+            # the next period is another day period (no night between)
+            suffix, increment = '_DAY', 0
+            if i < len(processed_periods) - 1:
+                next_name, _, next_is_night = processed_periods[i + 1]
+                if not next_is_night and next_name not in SAME_DAY_PERIOD_NAMES:
+                    increment = 1
 
+        labels = NIGHT_LABELS if suffix == '_NIGHT' else DAY_LABELS
+        if current_day_offset < len(labels):
+            relative_label = labels[current_day_offset]
         else:
-            # Regular day period (MON, TUE, WED, etc.)
-            relative_label = f'D{current_day_offset}_DAY'
+            relative_label = f'D{current_day_offset}{suffix}'
+        current_day_offset += increment
 
-            # Check if next period is another day period (no night between)
-            # If so, increment day offset after this period
-            if i < len(processed_periods) - 1:
-                next_period_name = processed_periods[i + 1][0]
-                # If next period is not a night period for this day, increment
-                if (not next_period_name.endswith(' NIGHT') and
-                    next_period_name not in ['TONIGHT', 'TODAY', 'REST OF TONIGHT', 'THIS AFTERNOON']):
-                    current_day_offset += 1
+        converted_append(''.join((relative_label, ' (', target_date, ') ', collapsed_content)))
+
+    return converted_periods
 
-        converted_periods.append(f'{relative_label} ({target_date}) {collapsed_content}')
+def _iter_forecast_blocks(input_file):
+    """
+    Yield '$$'-delimited forecast blocks from a memory-mapped file.
+
+    mmap.find locates delimiters at memchr speed without pulling the file
+    into the Python heap; each block is decoded to str only as it is
+    yielded, so peak memory stays bounded by the largest single block.
+    """
+    with open(input_file, 'rb') as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty file cannot be mapped
+
+        with mm:
+            pos = 0
+            size = len(mm)
+            while pos < size:
+                idx = mm.find(b'$$', pos)
+                end = idx if idx >= 0 else size
+                block = mm[pos:end].decode('utf-8').strip()
+                if block:
+                    yield block
+                if idx < 0:
+                    break
+                pos = idx + 2
+
+def _convert_forecast_block(block):
+    """
+    Pool worker: convert one \'$$\'-delimited forecast block.
+
+    Returns (status, fragments) where status is \'converted\', \'error\' or
+    \'passthrough\' and fragments is a tuple ready for writelines; None when
+    the block carries no forecast content.
+    """
+    # The timestamp sits on the first or second line of a well-formed block
+    # (after the PZZ655 header), so probe those with a few string ops before
+    # falling back to a regex scan plus find over the whole body
+    timestamp_str = None
+    content_start = 0
+    line_start = 0
+    for _ in range(2):
+        next_nl = block.find('\n', line_start)
+        candidate = (block[line_start:next_nl] if next_nl >= 0 else block[line_start:]).strip()
+        if (len(candidate) == 25 and candidate[4] == '-' and candidate[7] == '-'
+                and candidate[10] == 'T' and candidate.endswith('-08:00')):
+            timestamp_str = candidate
+            content_start = next_nl + 1 if next_nl >= 0 else len(block)
+            break
+        if next_nl < 0:
+            break
+        line_start = next_nl + 1
+
+    if timestamp_str is None:
+        # Find the timestamp anywhere in this block
+        timestamp_match = TIMESTAMP_PATTERN.search(block)
+
+        if not timestamp_match:
+            # No timestamp found, keep original
+            return ('passthrough', (block,))
 
-    # Join all converted periods
-    return '\n'.join(converted_periods)
+        timestamp_str = timestamp_match.group(0)
+        content_start = timestamp_match.end()
+
+    forecast_time = parse_forecast_timestamp(timestamp_str)
+
+    if not forecast_time:
+        # Failed to parse timestamp
+        return ('error', (block,))
+
+    # Extract the forecast content (everything after the timestamp line)
+    forecast_content = block[content_start:].strip()
+
+    if not forecast_content:
+        # No forecast content, skip this block
+        return None
+
+    # Only keep the issued line (no PZZ655 header)
+    issued_line = f"Issued: {timestamp_str}\n\n"
+
+    # Extract warnings and convert periods
+    warnings, clean_content = extract_warnings(forecast_content)
+    period_lines = convert_forecast_periods(clean_content, forecast_time)
+
+    # Reconstruct block as fragments: issued line + warnings + one fragment
+    # per period line, emitted in a single writelines batch downstream
+    out_parts = [issued_line]
+    if warnings:
+        out_parts.append(warnings)
+        out_parts.append("\n\n")
+    for j, line in enumerate(period_lines):
+        if j:
+            out_parts.append('\n')
+        out_parts.append(line)
+    return ('converted', tuple(out_parts))
+
+def iter_converted_forecasts(input_file, stats=None):
+    """
+    Yield converted forecast blocks one at a time as writelines-ready
+    fragment tuples.
+
+    Downstream consumers (e.g. training-data generation) can take this
+    stream directly and skip the write-then-reread round-trip through the
+    converted text file. Blocks are converted on a worker pool; pass a dict
+    as stats to collect 'processed' and 'errors' counts.
+
+    Args:
+        input_file: Path to input forecast file
+        stats: Optional dict updated with conversion counters
+
+    Yields:
+        Tuple of string fragments for one converted block
+    """
+    with Pool() as pool:
+        for result in pool.imap(_convert_forecast_block,
+                                _iter_forecast_blocks(input_file), chunksize=64):
+            if result is None:
+                continue
+
+            status, out_parts = result
+            if stats is not None:
+                if status == 'converted':
+                    stats['processed'] += 1
+                elif status == 'error':
+                    stats['errors'] += 1
+
+            yield out_parts
 
 def process_forecast_file(input_file, output_file):
     """
     Process the entire forecast file, converting all periods to relative format.
 
+    Thin wrapper that writes the iter_converted_forecasts() stream to disk.
+
     Args:
         input_file: Path to input forecast file
         output_file: Path to output file
     """
     print(f"Processing forecast file: {input_file}")
 
-    with open(input_file, 'r', encoding='utf-8') as file:
-        content = file.read()
-
-    # Split content by forecast delimiter
-    forecast_blocks = content.split('$$')
-    converted_blocks = []
-
-    processed_count = 0
-    error_count = 0
-
-    for block in forecast_blocks:
-        block = block.strip()
-        if not block:
-            converted_blocks.append('')
-            continue
-
-        # Find the timestamp in this block
-        timestamp_match = re.search(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}-08:00', block)
-
-        if timestamp_match:
-            timestamp_str = timestamp_match.group(0)
-            forecast_time = parse_forecast_timestamp(timestamp_str)
-
-            if forecast_time:
-                # Extract the forecast content (everything after the timestamp line)
-                timestamp_pos = block.find(timestamp_str)
-                timestamp_line_end = timestamp_pos + len(timestamp_str)
-                forecast_content = block[timestamp_line_end:].strip()
-
-                if forecast_content:
-                    # Only keep the issued line (no PZZ655 header)
-                    issued_line = f"Issued: {timestamp_str}\n\n"
-
-                    # Extract warnings and convert periods
-                    warnings, clean_content = extract_warnings(forecast_content)
-                    converted_content = convert_forecast_periods(clean_content, forecast_time)
-
-                    # Reconstruct block: issued line + warnings + converted content
-                    if warnings:
-                        converted_block = issued_line + warnings + "\n\n" + converted_content
-                    else:
-                        converted_block = issued_line + converted_content
-
-                    converted_blocks.append(converted_block)
-                    processed_count += 1
-                else:
-                    # No forecast content, skip this block
-                    continue
-            else:
-                # Failed to parse timestamp
-                converted_blocks.append(block)
-                error_count += 1
-        else:
-            # No timestamp found, keep original
-            converted_blocks.append(block)
-
-    # Write converted content with proper delimiter formatting
-    with open(output_file, 'w', encoding='utf-8') as file:
-        for i, block in enumerate(converted_blocks):
-            if block.strip():  # Only write non-empty blocks
-                file.write(block)
-                # Add delimiter after each forecast except the last one
-                if i < len(converted_blocks) - 1:
-                    file.write('\n\n$$\n\n')
-            elif i == 0:  # Handle case where first block might be empty
-                file.write('')
+    stats = {'processed': 0, 'errors': 0}
+
+    with open(output_file, 'w', encoding='utf-8') as fout:
+        first = True
+
+        for out_parts in iter_converted_forecasts(input_file, stats):
+            # Emit the separator before each block after the first, so no
+            # stray trailing delimiter is written for skipped blocks
+            if not first:
+                fout.write('\n\n$$\n\n')
+            fout.writelines(out_parts)
+            first = False
 
     print(f"Conversion completed:")
-    print(f"  Processed forecasts: {processed_count:,}")
-    print(f"  Parsing errors: {error_count:,}")
+    print(f"  Processed forecasts: {stats['processed']:,}")
+    print(f"  Parsing errors: {stats['errors']:,}")
     print(f"  Output saved to: {output_file}")
 
 def main():
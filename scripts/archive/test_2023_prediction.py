@@ -7,128 +7,167 @@ the specific few-shot examples that will be used for prediction.
 """
 
 import json
+import mmap
+import os
+import pickle
 import sys
-from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json parser
+
+# Shared wind/example I/O helpers live next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import wind_io
+
+
+def _build_date_index(ndjson_file):
+    """Scan the NDJSON file once, mapping day_0 dates to byte offsets."""
+    loads = orjson.loads if orjson is not None else json.loads
+    index = {}
+    offset = 0
+    with open(ndjson_file, 'rb', buffering=1 << 20) as f:
+        for line in f:
+            example = loads(line)
+            date = example.get('actual', {}).get('day_0', {}).get('date')
+            if date:
+                index.setdefault(date, []).append(offset)
+            offset += len(line)
+    return index
+
+
+def _load_date_index(ndjson_file):
+    """
+    Return the {day_0 date: [byte offsets]} index for the NDJSON file.
+
+    Cached in a .dateidx.pkl sidecar keyed on the NDJSON mtime, so the
+    linear scan happens once; afterwards a date lookup is O(1) plus a
+    handful of seeks. scripts/utilities/build_training_date_index.py
+    writes the same sidecar offline.
+    """
+    index_file = ndjson_file + '.dateidx.pkl'
+    mtime_ns = os.stat(ndjson_file).st_mtime_ns
+
+    try:
+        with open(index_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('mtime_ns') == mtime_ns:
+            return cached['index']
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass  # No sidecar yet (or stale/unreadable): rebuild below
+
+    index = _build_date_index(ndjson_file)
+    try:
+        tmp_file = index_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'mtime_ns': mtime_ns, 'index': index}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, index_file)  # Atomic: readers never see partial indexes
+    except OSError:
+        pass  # Read-only location: the index is best-effort
+    return index
+
+
+def _examples_at_offsets(ndjson_file, offsets):
+    """Yield the examples stored at the given NDJSON byte offsets."""
+    loads = orjson.loads if orjson is not None else json.loads
+    with open(ndjson_file, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # Empty file cannot be mapped
+        with mm:
+            for offset in offsets:
+                end = mm.find(b'\n', offset)
+                if end < 0:
+                    end = len(mm)
+                yield loads(mm[offset:end])
+
+
+def _iter_training_examples(training_file):
+    """
+    Yield training examples one at a time.
+
+    Prefers the NDJSON twin of the file (see
+    scripts/utilities/convert_training_examples_to_ndjson.py): one
+    example per line streams with constant memory and allows early
+    exit, instead of parsing the whole multi-MB array up front.
+    """
+    ndjson_file = training_file.replace('.json', '.ndjson')
+    loads = orjson.loads if orjson is not None else json.loads
+
+    try:
+        f = open(ndjson_file, 'rb', buffering=1 << 20)
+    except OSError:
+        # No NDJSON twin yet: fall back to loading the full array
+        with open(training_file, 'rb') as fallback:
+            raw = fallback.read()
+        yield from loads(raw)
+        return
+
+    with f:
+        for line in f:
+            yield loads(line)
+
 
 def find_actual_forecast_for_date(test_date_str):
     """Find the actual NWS forecast issued for the test date."""
     print(f"Searching for actual NWS forecast for {test_date_str}...")
 
     # Look in training data for a forecast issued for this date
-    with open('/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/training/training_examples.json', 'r') as f:
-        training_data = json.load(f)
+    training_file = '/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/training/training_examples.json'
+
+    # With the NDJSON twin present, the date index narrows the scan to
+    # the handful of examples whose day_0 matches, seeked directly.
+    ndjson_file = training_file.replace('.json', '.ndjson')
+    if os.path.exists(ndjson_file):
+        offsets = _load_date_index(ndjson_file).get(test_date_str, [])
+        examples = _examples_at_offsets(ndjson_file, offsets)
+    else:
+        examples = _iter_training_examples(training_file)
 
-    candidates = []
+    # First matching forecast is kept as the fallback; the scan stops
+    # at the first morning (number 2, 6AM-noon) forecast since that is
+    # what the original full-scan selection would have chosen anyway.
+    first_candidate = None
 
-    for example in training_data:
+    for example in examples:
         actual = example.get('actual', {})
         # Check if this forecast was for our test date
         if 'day_0' in actual and actual['day_0'].get('date') == test_date_str:
-            forecast_text = example.get('forecast', {})
-            issued = example.get('issued', '')
-            issuance_time = example.get('issuance_time', '')
-            number = example.get('number', 0)
-
-            candidates.append({
-                'issued': issued,
-                'issuance_time': issuance_time,
-                'number': number,
-                'forecast': forecast_text,
+            candidate = {
+                'issued': example.get('issued', ''),
+                'issuance_time': example.get('issuance_time', ''),
+                'number': example.get('number', 0),
+                'forecast': example.get('forecast', {}),
                 'example': example
-            })
-
-    if candidates:
-        # Sort by issuance time and pick a morning forecast
-        morning_forecasts = [c for c in candidates if c['number'] == 2]  # 6AM-noon
-        if morning_forecasts:
-            chosen = morning_forecasts[0]
-            print(f"  Found morning forecast issued at {chosen['issuance_time']}")
-            return chosen
-        else:
-            chosen = candidates[0]
-            print(f"  Found forecast #{chosen['number']} issued at {chosen['issuance_time']}")
-            return chosen
-    else:
-        print("  ❌ No actual forecast found for this date")
-        return None
+            }
+            if candidate['number'] == 2:
+                print(f"  Found morning forecast issued at {candidate['issuance_time']}")
+                return candidate
+            if first_candidate is None:
+                first_candidate = candidate
+
+    if first_candidate is not None:
+        print(f"  Found forecast #{first_candidate['number']} issued at {first_candidate['issuance_time']}")
+        return first_candidate
+
+    print("  ❌ No actual forecast found for this date")
+    return None
 
 
 def process_actual_wind_data_2023(test_date_str):
     """Process actual wind data for the 2023 test date."""
     print(f"Processing 2023 wind data for {test_date_str}...")
 
-    # Parse test date
-    test_date = datetime.strptime(test_date_str, '%Y-%m-%d')
-    year, month, day = test_date.year, test_date.month, test_date.day
-
     # 2023 data file
     wind_file = "/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/raw/wind/2023.txt"
 
-    hourly_data = {}
-
-    with open(wind_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split()
-            if len(parts) < 8:
-                continue
-
-            try:
-                file_year, file_month, file_day = int(parts[0]), int(parts[1]), int(parts[2])
-                file_hour, file_minute = int(parts[3]), int(parts[4])
+    actual_conditions = wind_io.aggregate_wind_for_date(wind_file, test_date_str)
 
-                # Check if this is our test date
-                if file_year == year and file_month == month and file_day == day:
-                    # Only process daytime hours (10 AM - 6 PM PST)
-                    if 10 <= file_hour <= 18:
-                        wspd_ms = float(parts[6])  # Wind speed in m/s
-                        gst_ms = float(parts[7])   # Gust speed in m/s
-
-                        # Filter invalid data
-                        if wspd_ms >= 99.0 or gst_ms >= 99.0:
-                            continue
-
-                        # Convert to knots
-                        wspd_kt = wspd_ms * 1.9
-                        gst_kt = gst_ms * 1.9
-
-                        # Group by hour
-                        if file_hour not in hourly_data:
-                            hourly_data[file_hour] = {'wspd': [], 'gst': []}
-
-                        hourly_data[file_hour]['wspd'].append(wspd_kt)
-                        hourly_data[file_hour]['gst'].append(gst_kt)
-
-            except (ValueError, IndexError):
-                continue
-
-    # Aggregate hourly data
-    actual_conditions = []
-
-    for hour in sorted(hourly_data.keys()):
-        if hourly_data[hour]['wspd'] and hourly_data[hour]['gst']:
-            avg_wspd = sum(hourly_data[hour]['wspd']) / len(hourly_data[hour]['wspd'])
-            max_gst = max(hourly_data[hour]['gst'])
-
-            actual_conditions.append({
-                'hour': f'{hour:02d}:00-{hour+1:02d}:00',
-                'wspd_avg_kt': round(avg_wspd, 1),
-                'gst_max_kt': round(max_gst, 1)
-            })
-
-    print(f"  Processed {len(actual_conditions)} hours of wind data")
-
-    if actual_conditions:
-        total_wspd = sum(h['wspd_avg_kt'] for h in actual_conditions)
-        avg_wspd = total_wspd / len(actual_conditions)
-        max_gst = max(h['gst_max_kt'] for h in actual_conditions)
-
-        print(f"  Summary: Avg WSPD = {avg_wspd:.1f}kt, Max GST = {max_gst:.1f}kt")
+    wind_io.print_wind_summary(actual_conditions)
 
     return actual_conditions
 
@@ -136,94 +175,85 @@ def process_actual_wind_data_2023(test_date_str):
 def select_non_conflicting_examples(month, forecast_number, test_date_str, num_examples=5):
     """Select few-shot examples ensuring they don't include our test date."""
 
-    month_names = ['', 'jan', 'feb', 'mar', 'apr', 'may', 'jun',
-                   'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-    month_name = month_names[month]
-
-    examples_file = f'/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/training/few_shot_examples/{month_name}_fc{forecast_number}_examples.json'
+    month_name = wind_io.MONTH_NAMES[month]
 
     print(f"Loading examples from {month_name}_fc{forecast_number}_examples.json...")
 
-    with open(examples_file, 'r') as f:
-        examples = json.load(f)
+    # Filter out any examples that include our test date, stopping as
+    # soon as enough safe ones are found — the tail of the file never
+    # needs its date checks
+    selected = wind_io.load_examples(month, forecast_number,
+                                     exclude_date=test_date_str,
+                                     limit=num_examples)
 
-    # Filter out any examples that include our test date
-    safe_examples = []
+    print(f"  Selected {len(selected)} safe examples (excluding test date)")
 
-    for example in examples:
-        actual = example.get('actual', {})
-        includes_test_date = False
-
-        for day_key in ['day_0', 'day_1', 'day_2', 'day_3', 'day_4']:
-            if day_key in actual:
-                date_str = actual[day_key].get('date', '')
-                if date_str == test_date_str:
-                    includes_test_date = True
-                    break
-
-        if not includes_test_date:
-            safe_examples.append(example)
+    return selected
 
-    print(f"  Filtered to {len(safe_examples)} safe examples (excluding test date)")
 
-    # Take first N examples
-    selected = safe_examples[:num_examples]
-    print(f"  Selected {len(selected)} examples for few-shot learning")
+# Constant prompt fragments, hoisted so they are allocated once at
+# import instead of on every formatter call
+_PROMPT_HEADER = "You are a wind forecasting expert. Given NWS coastal water forecasts, predict hourly wind speeds (WSPD) and gusts (GST) in knots for the 11 AM - 6 PM time window.\n\n"
 
-    return selected
+_PREDICTION_TEMPLATE = (
+    "  11:00-12:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  12:00-13:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  13:00-14:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  14:00-15:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  15:00-16:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  16:00-17:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  17:00-18:00: WSPD X.Xkt, GST Y.Ykt\n\n"
+)
 
 
 def format_2023_prediction_prompt(examples, actual_forecast, test_date_str):
     """Format prompt using actual 2023 forecast."""
 
-    prompt = "You are a wind forecasting expert. Given NWS coastal water forecasts, predict hourly wind speeds (WSPD) and gusts (GST) in knots for the 11 AM - 6 PM time window.\n\n"
-    prompt += "Here are examples of how to interpret forecasts:\n\n"
+    # Collect fragments and join once at the end: repeated `prompt +=`
+    # re-copies the whole string on every append (quadratic in prompt
+    # size), while list append + ''.join is linear.
+    parts = [_PROMPT_HEADER]
+    parts.append("Here are examples of how to interpret forecasts:\n\n")
 
     # Add few-shot examples
     for i, example in enumerate(examples, 1):
-        prompt += f"=== EXAMPLE {i} ===\n"
-        prompt += "FORECAST:\n"
+        parts.append(f"=== EXAMPLE {i} ===\n")
+        parts.append("FORECAST:\n")
 
         forecast = example.get('forecast', {})
         for period, text in forecast.items():
-            prompt += f"{period}: {text}\n"
+            parts.append(f"{period}: {text}\n")
 
-        prompt += "\nACTUAL WIND CONDITIONS:\n"
+        parts.append("\nACTUAL WIND CONDITIONS:\n")
 
         actual = example.get('actual', {})
         for day in ['day_0', 'day_1', 'day_2']:
             if day in actual and 'hourly' in actual[day]:
                 date = actual[day].get('date', 'Unknown')
-                prompt += f"{day} ({date}):\n"
+                parts.append(f"{day} ({date}):\n")
 
                 for hour_data in actual[day]['hourly']:
                     hour = hour_data.get('hour', '')
                     wspd = hour_data.get('wspd_avg_kt', 0)
                     gst = hour_data.get('gst_max_kt', 0)
-                    prompt += f"  {hour}: WSPD {wspd:.1f}kt, GST {gst:.1f}kt\n"
-                prompt += "\n"
+                    parts.append(f"  {hour}: WSPD {wspd:.1f}kt, GST {gst:.1f}kt\n")
+                parts.append("\n")
 
-        prompt += "\n"
+        parts.append("\n")
 
     # Add actual forecast
-    prompt += "=== FORECAST TO PREDICT ===\n"
-    prompt += "FORECAST:\n"
+    parts.append("=== FORECAST TO PREDICT ===\n")
+    parts.append("FORECAST:\n")
     for period, text in actual_forecast.items():
-        prompt += f"{period}: {text}\n"
+        parts.append(f"{period}: {text}\n")
 
-    prompt += f"\nBased on the patterns from the examples, predict hourly wind conditions for day_0 ({test_date_str}) from 11 AM - 6 PM:\n\n"
-    prompt += f"day_0 ({test_date_str}):\n"
-    prompt += "  11:00-12:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  12:00-13:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  13:00-14:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  14:00-15:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  15:00-16:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  16:00-17:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  17:00-18:00: WSPD X.Xkt, GST Y.Ykt\n\n"
+    parts.append(f"\nBased on the patterns from the examples, predict hourly wind conditions for day_0 ({test_date_str}) from 11 AM - 6 PM:\n\n")
+    parts.append(f"day_0 ({test_date_str}):\n")
+    parts.append(_PREDICTION_TEMPLATE)
 
-    prompt += "Provide only the prediction, analyzing the forecast text for wind patterns and timing."
+    parts.append("Provide only the prediction, analyzing the forecast text for wind patterns and timing.")
 
-    return prompt
+    return ''.join(parts)
 
 
 def main():
@@ -265,7 +295,8 @@ def main():
 
     # Save prompt
     prompt_file = "/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/training/test_2023_prediction_prompt.txt"
-    with open(prompt_file, 'w') as f:
+    # 1 MiB buffer: the prompt lands in a handful of write syscalls
+    with open(prompt_file, 'w', buffering=1 << 20) as f:
         f.write(prompt)
 
     print(f"📝 Prompt saved to: {prompt_file}")
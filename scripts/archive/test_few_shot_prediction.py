@@ -6,83 +6,21 @@ Tests the LLM few-shot prediction capability using real data from January 2025.
 Creates a mock forecast scenario and compares LLM prediction to actual wind conditions.
 """
 
-import json
 import sys
-from datetime import datetime, timedelta
 from pathlib import Path
 
+# Shared wind/example I/O helpers live next to this script
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import wind_io
+
 
 def process_actual_wind_data(wind_file, test_date_str):
     """Process actual wind data for the test date."""
     print(f"Processing actual wind data for {test_date_str}...")
 
-    # Parse test date
-    test_date = datetime.strptime(test_date_str, '%Y-%m-%d')
-    year, month, day = test_date.year, test_date.month, test_date.day
-
-    hourly_data = {}
-
-    with open(wind_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-
-            parts = line.split()
-            if len(parts) < 8:
-                continue
-
-            try:
-                file_year, file_month, file_day = int(parts[0]), int(parts[1]), int(parts[2])
-                file_hour, file_minute = int(parts[3]), int(parts[4])
-
-                # Check if this is our test date
-                if file_year == year and file_month == month and file_day == day:
-                    # Only process daytime hours (10 AM - 6 PM PST)
-                    if 10 <= file_hour <= 18:
-                        wspd_ms = float(parts[6])  # Wind speed in m/s
-                        gst_ms = float(parts[7])   # Gust speed in m/s
-
-                        # Filter invalid data
-                        if wspd_ms >= 99.0 or gst_ms >= 99.0:
-                            continue
-
-                        # Convert to knots
-                        wspd_kt = wspd_ms * 1.9
-                        gst_kt = gst_ms * 1.9
-
-                        # Group by hour
-                        if file_hour not in hourly_data:
-                            hourly_data[file_hour] = {'wspd': [], 'gst': []}
-
-                        hourly_data[file_hour]['wspd'].append(wspd_kt)
-                        hourly_data[file_hour]['gst'].append(gst_kt)
-
-            except (ValueError, IndexError):
-                continue
+    actual_conditions = wind_io.aggregate_wind_for_date(wind_file, test_date_str)
 
-    # Aggregate hourly data
-    actual_conditions = []
-
-    for hour in sorted(hourly_data.keys()):
-        if hourly_data[hour]['wspd'] and hourly_data[hour]['gst']:
-            avg_wspd = sum(hourly_data[hour]['wspd']) / len(hourly_data[hour]['wspd'])
-            max_gst = max(hourly_data[hour]['gst'])
-
-            actual_conditions.append({
-                'hour': f'{hour:02d}:00-{hour+1:02d}:00',
-                'wspd_avg_kt': round(avg_wspd, 1),
-                'gst_max_kt': round(max_gst, 1)
-            })
-
-    print(f"  Processed {len(actual_conditions)} hours of wind data")
-
-    if actual_conditions:
-        total_wspd = sum(h['wspd_avg_kt'] for h in actual_conditions)
-        avg_wspd = total_wspd / len(actual_conditions)
-        max_gst = max(h['gst_max_kt'] for h in actual_conditions)
-
-        print(f"  Summary: Avg WSPD = {avg_wspd:.1f}kt, Max GST = {max_gst:.1f}kt")
+    wind_io.print_wind_summary(actual_conditions)
 
     return actual_conditions
 
@@ -90,18 +28,12 @@ def process_actual_wind_data(wind_file, test_date_str):
 def select_few_shot_examples(month, forecast_number, num_examples=5):
     """Select few-shot examples for the given month and forecast number."""
 
-    # Determine month name
-    month_names = ['', 'jan', 'feb', 'mar', 'apr', 'may', 'jun',
-                   'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
-    month_name = month_names[month]
-
-    # Load few-shot examples
-    examples_file = f'/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/training/few_shot_examples/{month_name}_fc{forecast_number}_examples.json'
+    month_name = wind_io.MONTH_NAMES[month]
 
     print(f"Loading few-shot examples from {month_name}_fc{forecast_number}_examples.json...")
 
-    with open(examples_file, 'r') as f:
-        examples = json.load(f)
+    # Load few-shot examples
+    examples = wind_io.load_examples(month, forecast_number)
 
     # Take first N examples for simplicity
     selected = examples[:num_examples]
@@ -149,55 +81,67 @@ def create_mock_forecast(test_date_str):
     return mock_forecast
 
 
+# Constant prompt fragments, hoisted so they are allocated once at
+# import instead of on every formatter call
+_PROMPT_HEADER = "You are a wind forecasting expert. Given NWS coastal water forecasts, predict hourly wind speeds (WSPD) and gusts (GST) in knots for the 11 AM - 6 PM time window.\n\n"
+
+_PREDICTION_TEMPLATE = (
+    "day_0 (2025-01-15):\n"
+    "  11:00-12:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  12:00-13:00: WSPD X.Xkt, GST Y.Ykt\n"
+    "  ...\n"
+    "  17:00-18:00: WSPD X.Xkt, GST Y.Ykt\n\n"
+)
+
+
 def format_few_shot_prompt(examples, test_forecast):
     """Format the few-shot prompt for LLM."""
 
-    prompt = "You are a wind forecasting expert. Given NWS coastal water forecasts, predict hourly wind speeds (WSPD) and gusts (GST) in knots for the 11 AM - 6 PM time window.\n\n"
+    # Collect fragments and join once at the end: repeated `prompt +=`
+    # re-copies the whole string on every append (quadratic in prompt
+    # size), while list append + ''.join is linear.
+    parts = [_PROMPT_HEADER]
 
-    prompt += "Here are examples of how to interpret forecasts and make predictions:\n\n"
+    parts.append("Here are examples of how to interpret forecasts and make predictions:\n\n")
 
     # Add few-shot examples
     for i, example in enumerate(examples, 1):
-        prompt += f"=== EXAMPLE {i} ===\n"
-        prompt += "FORECAST:\n"
+        parts.append(f"=== EXAMPLE {i} ===\n")
+        parts.append("FORECAST:\n")
 
         forecast = example.get('forecast', {})
         for period, text in forecast.items():
-            prompt += f"{period}: {text}\n"
+            parts.append(f"{period}: {text}\n")
 
-        prompt += "\nACTUAL WIND CONDITIONS:\n"
+        parts.append("\nACTUAL WIND CONDITIONS:\n")
 
         actual = example.get('actual', {})
         for day in ['day_0', 'day_1', 'day_2']:
             if day in actual and 'hourly' in actual[day]:
                 date = actual[day].get('date', 'Unknown')
-                prompt += f"{day} ({date}):\n"
+                parts.append(f"{day} ({date}):\n")
 
                 for hour_data in actual[day]['hourly']:
                     hour = hour_data.get('hour', '')
                     wspd = hour_data.get('wspd_avg_kt', 0)
                     gst = hour_data.get('gst_max_kt', 0)
-                    prompt += f"  {hour}: WSPD {wspd:.1f}kt, GST {gst:.1f}kt\n"
-                prompt += "\n"
+                    parts.append(f"  {hour}: WSPD {wspd:.1f}kt, GST {gst:.1f}kt\n")
+                parts.append("\n")
 
-        prompt += "\n"
+        parts.append("\n")
 
     # Add test forecast
-    prompt += "=== NEW FORECAST TO PREDICT ===\n"
-    prompt += "FORECAST:\n"
+    parts.append("=== NEW FORECAST TO PREDICT ===\n")
+    parts.append("FORECAST:\n")
     for period, text in test_forecast.items():
-        prompt += f"{period}: {text}\n"
+        parts.append(f"{period}: {text}\n")
 
-    prompt += "\nBased on the patterns from the examples above, predict the hourly wind conditions for day_0 (11 AM - 6 PM) in this format:\n"
-    prompt += "day_0 (2025-01-15):\n"
-    prompt += "  11:00-12:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  12:00-13:00: WSPD X.Xkt, GST Y.Ykt\n"
-    prompt += "  ...\n"
-    prompt += "  17:00-18:00: WSPD X.Xkt, GST Y.Ykt\n\n"
+    parts.append("\nBased on the patterns from the examples above, predict the hourly wind conditions for day_0 (11 AM - 6 PM) in this format:\n")
+    parts.append(_PREDICTION_TEMPLATE)
 
-    prompt += "Provide only the prediction in the specified format, analyzing the forecast text for wind speed ranges and timing patterns."
+    parts.append("Provide only the prediction in the specified format, analyzing the forecast text for wind speed ranges and timing patterns.")
 
-    return prompt
+    return ''.join(parts)
 
 
 def main():
@@ -243,7 +187,8 @@ def main():
 
     # Save prompt for inspection
     prompt_file = "/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm/data/training/test_prediction_prompt.txt"
-    with open(prompt_file, 'w') as f:
+    # 1 MiB buffer: the prompt lands in a handful of write syscalls
+    with open(prompt_file, 'w', buffering=1 << 20) as f:
         f.write(prompt)
 
     print(f"📝 Full prompt saved to: {prompt_file}")
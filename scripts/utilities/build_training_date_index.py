@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Build the date index sidecar for training_examples.ndjson.
+
+Maps each day_0 date to the byte offsets of the examples forecasting it,
+so date lookups become an O(1) dict hit plus a few seeks instead of a
+linear scan of the whole file. The sidecar is keyed on the NDJSON mtime;
+consumers (e.g. scripts/archive/test_2023_prediction.py) rebuild it on
+demand if it is missing or stale, so running this script is optional —
+it just front-loads the one-time scan.
+"""
+
+import json
+import os
+import pickle
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json parser
+
+
+def build_date_index(ndjson_path, index_path):
+    """
+    Scan an NDJSON examples file and persist {date: [byte_offsets]}.
+
+    Args:
+        ndjson_path: Source .ndjson file path
+        index_path: Destination .dateidx.pkl sidecar path
+
+    Returns:
+        Number of indexed dates.
+    """
+    loads = orjson.loads if orjson is not None else json.loads
+    index = {}
+    offset = 0
+
+    with open(ndjson_path, 'rb', buffering=1 << 20) as f:
+        for line in f:
+            example = loads(line)
+            date = example.get('actual', {}).get('day_0', {}).get('date')
+            if date:
+                index.setdefault(date, []).append(offset)
+            offset += len(line)
+
+    mtime_ns = os.stat(ndjson_path).st_mtime_ns
+    tmp_path = f"{index_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'mtime_ns': mtime_ns, 'index': index}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, index_path)  # Atomic: readers never see partial indexes
+
+    return len(index)
+
+
+def main():
+    """Build the date index for the master NDJSON training file."""
+    base_dir = Path("/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm")
+    ndjson_path = base_dir / "data/training/training_examples.ndjson"
+    index_path = f"{ndjson_path}.dateidx.pkl"
+
+    print("TRAINING DATE INDEX BUILD")
+    print("=" * 50)
+
+    if not ndjson_path.exists():
+        print(f"❌ NDJSON file not found: {ndjson_path}")
+        print("   Run scripts/utilities/convert_training_examples_to_ndjson.py first.")
+        return
+
+    dates = build_date_index(ndjson_path, index_path)
+
+    print(f"✅ Indexed {dates} dates into {Path(index_path).name}")
+
+
+if __name__ == "__main__":
+    main()
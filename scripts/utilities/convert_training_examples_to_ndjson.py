@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+One-off migration: emit training_examples.json as NDJSON.
+
+The master training file is a single multi-MB JSON array, which forces
+consumers to parse the whole file just to find one example. NDJSON (one
+compact example per line) lets them stream line by line with constant
+memory and stop as soon as they find a match.
+"""
+
+import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to the stdlib json serializer
+
+
+def convert_to_ndjson(json_path, ndjson_path):
+    """
+    Rewrite a JSON array file as NDJSON (one example per line).
+
+    Args:
+        json_path: Source training_examples.json path
+        ndjson_path: Destination .ndjson path
+
+    Returns:
+        Number of examples written.
+    """
+    with open(json_path, 'rb') as f:
+        raw = f.read()
+    examples = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    count = 0
+    with open(ndjson_path, 'wb') as f:
+        for example in examples:
+            if orjson is not None:
+                f.write(orjson.dumps(example))
+            else:
+                f.write(json.dumps(example, separators=(',', ':')).encode('utf-8'))
+            f.write(b'\n')
+            count += 1
+
+    return count
+
+
+def main():
+    """Convert the master training examples file to NDJSON."""
+    base_dir = Path("/Users/davidelasi/Documents/Wind_Model/wind-forecast-llm")
+    json_path = base_dir / "data/training/training_examples.json"
+    ndjson_path = base_dir / "data/training/training_examples.ndjson"
+
+    print("TRAINING EXAMPLES -> NDJSON MIGRATION")
+    print("=" * 50)
+
+    if not json_path.exists():
+        print(f"❌ Source file not found: {json_path}")
+        return
+
+    count = convert_to_ndjson(json_path, ndjson_path)
+
+    print(f"✅ Wrote {count} examples to {ndjson_path.name}")
+
+
+if __name__ == "__main__":
+    main()